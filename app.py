@@ -3,37 +3,57 @@ import os
 import time
 import csv
 
+import pandas as pd
 import streamlit as st
 st.set_page_config(page_title="Maps Lead Studio", layout="wide")
 
 import os
 import time
 import csv
+import functools
+import gc
+import importlib.util
+import io
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import warnings
+from typing import Final, Optional
 
-from main import scrape_places, save_places_to_csv, generate_report
+from main import (
+    ScrapingStats,
+    scrape_places,
+    save_places_to_csv,
+    generate_report,
+    init_dedup_db,
+    load_known_leads,
+)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_RESULTS_DIR_NAME = "../results"
 DEFAULT_RESULTS_DIR = os.path.join(BASE_DIR, DEFAULT_RESULTS_DIR_NAME)
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+CSV_IO_BUFFER = 1 << 20
+REPAIR_SAMPLE_ROWS = 1000
 
 
 def repair_csv_columns(path: str) -> str:
-    with open(path, newline="", encoding="utf-8") as handle:
-        rows = list(csv.reader(handle))
-    if not rows:
+    with open(path, newline="", encoding="utf-8", buffering=CSV_IO_BUFFER) as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if not header:
+            return ""
+        # Detect the layout from a sample; the rewrite pass validates the rest.
+        row_lengths = {len(row) for row in itertools.islice(reader, REPAIR_SAMPLE_ROWS)}
+        if row_lengths == {len(header)}:
+            # The sample looks clean, so the wider rows must be further down.
+            row_lengths.update(len(row) for row in reader)
+    if not row_lengths:
         return ""
 
-    header = rows[0]
-    if not header:
-        return ""
-
-    data_rows = rows[1:]
-    if not data_rows:
-        return ""
-
-    row_lengths = {len(row) for row in data_rows}
     max_len = max(row_lengths)
     min_len = min(row_lengths)
 
@@ -47,12 +67,14 @@ def repair_csv_columns(path: str) -> str:
     if extra_fields not in {1, 2}:
         return ""
 
-    if any(length not in {len(header), len(header) + extra_fields} for length in row_lengths):
+    allowed_lengths = {len(header), len(header) + extra_fields}
+    if not row_lengths <= allowed_lengths:
         return ""
 
     insert_at = header.index("in_store_pickup")
     new_header = header[:insert_at] + ["store_shopping"] + header[insert_at:]
 
+    insert_delivery_at = None
     if extra_fields == 2:
         insert_delivery_at = new_header.index("in_store_pickup") + 1
         new_header = (
@@ -61,45 +83,143 @@ def repair_csv_columns(path: str) -> str:
             + new_header[insert_delivery_at:]
         )
 
-    new_rows = [new_header]
-    for row in data_rows:
-        if len(row) == len(header):
-            row = row[:insert_at] + [""] + row[insert_at:]
-            if extra_fields == 2:
-                insert_delivery_at = new_header.index("store_delivery")
-                row = row[:insert_delivery_at] + [""] + row[insert_delivery_at:]
-        new_rows.append(row)
-
-    if path.lower().endswith(".csv"):
-        repaired_path = path[:-4] + "_repaired.csv"
-    else:
-        repaired_path = path + "_repaired.csv"
+    header_len = len(header)
+    rows_valid = True
+
+    def repaired_rows(reader):
+        nonlocal rows_valid
+        for row in reader:
+            if len(row) not in allowed_lengths:
+                rows_valid = False
+                return
+            if len(row) == header_len:
+                row.insert(insert_at, "")
+                if insert_delivery_at is not None:
+                    row.insert(insert_delivery_at, "")
+            yield row
+
+    stem, ext = os.path.splitext(path)
+    repaired_path = f"{stem}_repaired{ext or '.csv'}"
+
+    with open(path, newline="", encoding="utf-8", buffering=CSV_IO_BUFFER) as source, \
+            open(repaired_path, "w", newline="", encoding="utf-8", buffering=CSV_IO_BUFFER) as handle:
+        reader = csv.reader(source)
+        next(reader, None)
+        writer = csv.writer(handle, lineterminator="\n")
+        writer.writerow(new_header)
+        writer.writerows(repaired_rows(reader))
+
+    if not rows_valid:
+        # A row past the sample did not fit the detected layout; drop the partial output.
+        os.remove(repaired_path)
+        return ""
+    return repaired_path
 
-    with open(repaired_path, "w", newline="", encoding="utf-8") as handle:
-        csv.writer(handle).writerows(new_rows)
 
-    return repaired_path
+PREVIEW_ROWS = 200
+EMAIL_FILTER_MODES: Final = {
+    "Strict (recommended)": "strict",
+    "Balanced": "balanced",
+    "None (save everything)": "none",
+}
 
 
-def load_csv_safe(path: str) -> tuple:
-    import pandas as pd
+def read_csv_fast(path: str, nrows: Optional[int] = None):
+    # Only the bounded preview is ever read, and the pyarrow engine does not
+    # support nrows, so the C engine is used throughout.
+    return pd.read_csv(path, engine="c", low_memory=False, cache_dates=True, nrows=nrows)
+
+
+def columns_consistent(path: str, probe_bytes: int = 1 << 16) -> bool:
+    """Check field counts on the first rows of a CSV without parsing the whole file."""
+    with open(path, "rb") as handle:
+        chunk = handle.read(probe_bytes)
+    truncated = len(chunk) == probe_bytes
+    rows = list(csv.reader(io.StringIO(chunk.decode("utf-8", errors="ignore"), newline="")))
+    if truncated and rows:
+        # The final row may have been cut mid-record.
+        rows.pop()
+    return len({len(row) for row in rows if row}) <= 1
+
+
+def read_repaired_csv(path: str, nrows: Optional[int] = None):
+    repaired_path = repair_csv_columns(path)
+    if not repaired_path:
+        return None, ""
+    warning = (
+        "Detected inconsistent columns in the CSV. "
+        f"Created a repaired file at {repaired_path}."
+    )
+    return read_csv_fast(repaired_path, nrows=nrows), warning
+
+
+def load_csv_safe(path: str, nrows: Optional[int] = None) -> tuple:
+    repair_tried = False
+    if not columns_consistent(path):
+        # Skip the parse that is bound to fail and repair up front.
+        df, warning = read_repaired_csv(path, nrows=nrows)
+        if df is not None:
+            return df, warning
+        repair_tried = True
     try:
-        return pd.read_csv(path), ""
+        return read_csv_fast(path, nrows=nrows), ""
     except pd.errors.ParserError as exc:
-        repaired_path = repair_csv_columns(path)
-        if repaired_path:
-            df = pd.read_csv(repaired_path)
-            warning = (
-                "Detected inconsistent columns in the CSV. "
-                f"Created a repaired file at {repaired_path}."
-            )
+        if repair_tried:
+            # The repair already failed above; scanning the file again won't help.
+            raise
+        df, warning = read_repaired_csv(path, nrows=nrows)
+        if df is not None:
             return df, warning
         raise exc
 
 
-def apply_theme() -> None:
-    st.markdown(
-        """
+def load_csv_preview(path: str, nrows: int = PREVIEW_ROWS) -> tuple:
+    return load_csv_safe(path, nrows=nrows)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_csv_cached(path: str, mtime: float, size: int) -> tuple:
+    # mtime and size are only part of the cache key so a rewritten file is re-read.
+    # cache_resource hands back the same frame instead of unpickling a copy per rerun;
+    # callers must treat it as read-only.
+    df, warning = load_csv_preview(path)
+    # st.dataframe ships Arrow to the browser; convert once here instead of per rerun.
+    if _HAS_PYARROW:
+        import pyarrow as pa
+        display = pa.Table.from_pandas(df, preserve_index=False)
+    else:
+        display = df
+    return df, warning, display
+
+
+# Each rewrite of a file is a new cache key; keep only the latest few versions.
+@st.cache_data(max_entries=8, show_spinner=False)
+def read_file_bytes_cached(path: str, mtime: float, size: int) -> bytes:
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+def stat_path(path: str) -> Optional[os.stat_result]:
+    """Return the file's stat result, or None if it does not exist."""
+    if not path:
+        return None
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def load_file_bytes(path: str, file_stat: os.stat_result) -> bytes:
+    return read_file_bytes_cached(path, file_stat.st_mtime, file_stat.st_size)
+
+
+def load_output_csv(path: str, file_stat: Optional[os.stat_result]) -> tuple:
+    if file_stat is None:
+        return None, "", None
+    return load_csv_cached(path, file_stat.st_mtime, file_stat.st_size)
+
+
+THEME_CSS: Final[str] = """
         <style>
         /* Modern Font Stack */
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
@@ -179,30 +299,9 @@ def apply_theme() -> None:
             letter-spacing: -0.025em;
         }
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
-def normalize_results_dir(path_value: str) -> str:
-    cleaned = os.path.expanduser(path_value.strip()) if path_value else ""
-    if not cleaned:
-        return DEFAULT_RESULTS_DIR
-    if os.path.isabs(cleaned):
-        return cleaned
-    return os.path.join(BASE_DIR, cleaned)
-
+"""
 
-def normalize_output_name(name: str) -> str:
-    cleaned = name.strip() if name else ""
-    if not cleaned:
-        cleaned = "results.csv"
-    if not cleaned.lower().endswith(".csv"):
-        cleaned += ".csv"
-    return cleaned
-
-
-def render_hero() -> None:
-    st.markdown(
-        """
+HERO_HTML: Final[str] = """
         <div class="hero">
             <div>
                 <div class="hero-eyebrow">Google Maps Scraper</div>
@@ -231,22 +330,492 @@ def render_hero() -> None:
                 </div>
             </div>
         </div>
-        """,
-        unsafe_allow_html=True,
-    )
+"""
+
+
+@st.cache_data(show_spinner=False)
+def build_rate_df(success_rate: float, email_rate: float, social_rate: float):
+    return pd.DataFrame(
+        {
+            "Metric": ["Success", "Email", "Social"],
+            "Percent": [success_rate, email_rate, social_rate],
+        }
+    ).set_index("Metric")
+
+
+@functools.lru_cache(maxsize=64)
+def panel_header(title: str, subtitle: str = "") -> str:
+    """Self-contained markup for a panel's title and optional subtitle."""
+    html = f"<div class=\"panel\"><div class=\"section-title\">{title}</div>"
+    if subtitle:
+        html += f"<div class=\"section-subtitle\">{subtitle}</div>"
+    return html + "</div>"
+
+
+RESULTS_EMPTY_PANEL: Final[str] = panel_header("Results", "Run a scrape to populate results.")
+PREVIEW_EMPTY_PANEL: Final[str] = panel_header("Data preview", "No data loaded yet.")
+
+
+def apply_theme() -> None:
+    st.markdown(THEME_CSS, unsafe_allow_html=True)
+
+
+def normalize_results_dir(path_value: str) -> str:
+    cleaned = os.path.expanduser(path_value.strip()) if path_value else ""
+    if not cleaned:
+        return DEFAULT_RESULTS_DIR
+    if os.path.isabs(cleaned):
+        return cleaned
+    return os.path.join(BASE_DIR, cleaned)
+
+
+def normalize_output_name(name: str) -> str:
+    cleaned = name.strip() if name else ""
+    if not cleaned:
+        cleaned = "results.csv"
+    if not cleaned.lower().endswith(".csv"):
+        cleaned += ".csv"
+    return cleaned
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def resolve_paths(
+    results_dir_input: str,
+    output_name: str,
+    dedup_enabled: bool,
+    dedup_db_input: str,
+) -> tuple:
+    results_dir = normalize_results_dir(results_dir_input)
+    output_name = normalize_output_name(output_name)
+    if os.path.isabs(output_name):
+        output_path = output_name
+    else:
+        output_path = os.path.join(results_dir, output_name)
+
+    if dedup_enabled:
+        if os.path.isabs(dedup_db_input):
+            dedup_db_path = dedup_db_input
+        else:
+            dedup_db_path = os.path.join(results_dir, dedup_db_input)
+    else:
+        dedup_db_path = None
+
+    return results_dir, output_path, dedup_db_path
+
+
+def render_hero() -> None:
+    st.markdown(HERO_HTML, unsafe_allow_html=True)
+
+
+LIVE_REFRESH_SECONDS = 0.5
+
+
+class BatchRun:
+    """A batch of searches scraping on worker threads, polled by the Live run fragment.
+
+    Workers append finished searches to the CSV and write the report
+    themselves, so results reach disk even if no browser tab is polling.
+    poll() only refreshes the progress shown in the UI.
+    """
+
+    def __init__(
+        self,
+        search_queries: list,
+        output_path: str,
+        append: bool,
+        max_parallel: int,
+        scrape_kwargs: dict,
+    ) -> None:
+        self.search_queries = search_queries
+        self.output_path = output_path
+        self.append = append
+        self.scrape_kwargs = scrape_kwargs
+        # One dedup map per batch, read when it starts, so the parallel searches
+        # skip each other's leads and later batches see leads from other processes.
+        self.known_leads = None
+        if scrape_kwargs.get("dedup_enabled") and scrape_kwargs.get("dedup_db_path"):
+            conn = init_dedup_db(scrape_kwargs["dedup_db_path"])
+            try:
+                self.known_leads = load_known_leads(conn)
+            finally:
+                conn.close()
+        self.total_queries = len(search_queries)
+        self.log_lines = deque(maxlen=12)
+        # Per-query completion fraction; finished queries are pinned at 1.0.
+        self.query_progress = [0.0] * self.total_queries
+        # Finished queries are written in query order so the CSV layout does not
+        # depend on completion order; out-of-order results wait here.
+        self.query_results = [None] * self.total_queries
+        self.next_to_flush = 0
+        self.overall_stats = None
+        self.output_written = False
+        self.report_path = ""
+        self.errors = []
+        self.latest_index = None
+        self.latest_payload = {}
+        self.start_ts = time.time()
+        self.duration = None
+        self.finished = False
+        # Guards the result, file and progress state shared by workers and poll()
+        self.lock = threading.Lock()
+        # Worker threads cannot touch Streamlit elements, so they queue payloads for the script thread.
+        self.updates = queue.Queue()
+        executor = ThreadPoolExecutor(max_workers=max_parallel)
+        for index in range(self.total_queries):
+            future = executor.submit(self._run_query, index)
+            future.add_done_callback(functools.partial(self._on_query_done, index))
+        # No more work will be submitted; queued searches still run to completion.
+        executor.shutdown(wait=False)
+
+    def _run_query(self, query_index: int) -> tuple:
+        query = self.search_queries[query_index]
+        self.updates.put((query_index, {"message": f"--- Starting: {query} ---"}))
+        # Each scrape_places call launches its own browser.
+        return scrape_places(
+            query,
+            progress_callback=lambda payload: self.updates.put((query_index, payload)),
+            known_leads=self.known_leads,
+            **self.scrape_kwargs,
+        )
+
+    def _apply_update(self, query_index: int, payload: dict) -> None:
+        message = payload.get("message", "")
+        if message:
+            prefix = f"[{query_index + 1}/{self.total_queries}] ({self.search_queries[query_index]}) "
+            self.log_lines.append(prefix + message)
+        if self.query_progress[query_index] < 1.0:
+            found = int(payload.get("found", 0))
+            target = int(payload.get("target", self.scrape_kwargs["total"])) or 1
+            # Cap the internal progress for this phrase at 0.99 so we rely on term completion to push it
+            self.query_progress[query_index] = min(found / target, 0.99)
+        self.latest_index = query_index
+        self.latest_payload = payload
+
+    def _on_query_done(self, query_index: int, future) -> None:
+        """Done-callback on the worker thread: store the result and write what is ready."""
+        try:
+            result = future.result()
+        except Exception as exc:
+            logging.warning(f"Search '{self.search_queries[query_index]}' failed: {exc}")
+            result = ([], None)
+            with self.lock:
+                self.errors.append(f"{self.search_queries[query_index]}: {exc}")
+        with self.lock:
+            self.query_results[query_index] = result
+            self.query_progress[query_index] = 1.0
+            self._flush_ready_results()
+            if self.next_to_flush == self.total_queries:
+                self._finalize()
+
+    def _flush_ready_results(self) -> None:
+        while self.next_to_flush < self.total_queries and self.query_results[self.next_to_flush] is not None:
+            query = self.search_queries[self.next_to_flush]
+            places, stats = self.query_results[self.next_to_flush]
+            self.query_results[self.next_to_flush] = None
+            self.next_to_flush += 1
+            # A failed write must not stall the rest of the batch
+            try:
+                self._flush_query_result(places, stats)
+            except Exception as exc:
+                logging.warning(f"Saving results for '{query}' failed: {exc}")
+                self.errors.append(f"{query}: saving results failed: {exc}")
+
+    def _flush_query_result(self, places: list, stats) -> None:
+        # Append after the first write so the batch streams into one CSV
+        save_places_to_csv(places, self.output_path, append=self.append or self.output_written)
+        self.output_written = self.output_written or bool(places)
+        
+        # Aggregate stats
+        if stats is None:
+            return
+        if self.overall_stats is None:
+            self.overall_stats = stats
+        else:
+            self.overall_stats.merge(stats)
+
+    def _finalize(self) -> None:
+        # Recalc proper average from total items vs total duration
+        self.duration = time.time() - self.start_ts
+        stats = self.overall_stats
+        if stats and stats.total_searched > 0:
+            stats.average_time_per_business = self.duration / stats.total_searched
+
+        # Report on whatever reached the CSV, even if a search crashed mid-batch
+        try:
+            if stats:
+                self.report_path = generate_report(stats, self.output_path) or ""
+        except Exception as exc:
+            logging.warning(f"Writing the batch report failed: {exc}")
+            self.errors.append(f"Writing the report failed: {exc}")
+        finally:
+            # Always finish, or no session could start another batch
+            self.finished = True
+
+    @property
+    def progress(self) -> float:
+        return min(sum(self.query_progress) / self.total_queries, 1.0)
+
+    def poll(self) -> bool:
+        """Apply queued progress for the UI; return True once the batch is done."""
+        with self.lock:
+            while True:
+                try:
+                    query_index, payload = self.updates.get_nowait()
+                except queue.Empty:
+                    break
+                self._apply_update(query_index, payload)
+            return self.finished
+
+
+class BatchRegistry:
+    """The server's current batch, shared by every session.
+
+    session_state is per browser tab, so a refreshed or reopened tab would
+    otherwise lose track of a batch that is still scraping.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.current: Optional[BatchRun] = None
+
+
+@st.cache_resource(show_spinner=False)
+def get_batch_registry() -> BatchRegistry:
+    # cache_resource keeps one instance for the process across script reruns.
+    return BatchRegistry()
+
+
+def attach_current_run() -> None:
+    """Point a session with no run of its own at the server's current batch."""
+    run = get_batch_registry().current
+    session = st.session_state
+    if run is None or session.get("active_run") or session.get("last_run") is run:
+        return
+    # Includes a batch that finished while no tab was open, so its results still show.
+    session["active_run"] = run
+
+
+def start_batch_run(
+    niches: list,
+    locations: list,
+    results_dir: str,
+    output_path: str,
+    append: bool,
+    max_parallel: int,
+    scrape_kwargs: dict,
+) -> str:
+    """Validate the form and start a BatchRun; return an error message on failure."""
+    if not niches or not locations:
+        return "Please provide at least one niche and one location."
+    if not scrape_kwargs["extract_emails"] and not scrape_kwargs["include_without_email"]:
+        return "Fix the data capture options before running."
+
+    os.makedirs(results_dir, exist_ok=True)
+    # Build search Queries
+    search_queries = [f"{n} in {l}" for n in niches for l in locations]
+    registry = get_batch_registry()
+    with registry.lock:
+        # Checked server-wide so a refreshed tab can't start a second batch alongside
+        if registry.current is not None and not registry.current.finished:
+            return "A scrape is already running; wait for it to finish."
+        registry.current = BatchRun(
+            search_queries, output_path, append, max_parallel, scrape_kwargs
+        )
+    st.session_state["active_run"] = registry.current
+    return ""
+
+
+def render_live_run() -> None:
+    run = st.session_state.get("active_run") or st.session_state.get("last_run")
+    finished = run.poll() if run else False
+
+    st.progress(run.progress if run else 0)
+    payload = run.latest_payload if run else {}
+    if run is None:
+        st.write("")
+    elif finished:
+        st.write(f"Batch complete in {run.duration:.1f}s. Scraped {run.total_queries} queries.")
+    elif run.latest_index is not None:
+        # Only update live status text, don't flood logs
+        st.write(
+            f"Running query {run.latest_index + 1}/{run.total_queries}: "
+            f"{run.search_queries[run.latest_index]} ..."
+        )
+    else:
+        st.write(f"Starting batch of {run.total_queries} searches...")
+
+    listing_index = payload.get("listing_index")
+    listings_total = payload.get("listings_total")
+    if listing_index and listings_total:
+        st.write(f"Listing {listing_index} of {listings_total}")
+    elif listings_total:
+        st.write(f"Listings available: {listings_total}")
+
+    # Note: Metrics below show stats for the most recently reporting scrape_places call
+    # We would need a better aggregator for global stats live, but for now we show current run activity
+    col1, col2, col3, col4 = st.columns(4)
+    if run:
+        col1.metric("Listings processed (current)", int(payload.get("processed", 0)))
+        col2.metric("Leads saved (current)", int(payload.get("found", 0)))
+        col3.metric("Emails (current)", int(payload.get("emails_found", 0)))
+    else:
+        col1.metric("Listings processed", 0)
+        col2.metric("Leads saved", 0)
+        col3.metric("Emails found", 0)
+    col4.metric("Failed listings", 0)
+
+    stat_col1, stat_col2, stat_col3 = st.columns(3)
+    stat_col1.metric("Websites visited", 0)
+    stat_col2.metric("Duplicates skipped", 0)
+    stat_col3.metric("Listings available", 0)
+
+    if run and run.log_lines:
+        st.code("\n".join(run.log_lines), language="text")
+    if run and finished:
+        for error in run.errors:
+            st.error(f"Search failed: {error}")
+
+    if st.session_state.get("active_run") is run and finished and run is not None:
+        st.session_state["active_run"] = None
+        st.session_state["last_run"] = run
+        st.session_state["last_output_path"] = run.output_path
+        st.session_state["last_output_basename"] = os.path.basename(run.output_path)
+        # Empty if no report was written, so an older one isn't offered
+        st.session_state["last_report_path"] = run.report_path
+        st.session_state["last_report_basename"] = os.path.basename(run.report_path)
+        st.session_state["last_stats"] = run.overall_stats
+        st.session_state["last_duration"] = run.duration
+        # Full rerun so the Results and Data preview tabs pick up the new files
+        st.rerun()
+
+
+@st.fragment
+def render_results_tab(
+    stats: Optional[ScrapingStats],
+    last_duration: Optional[float],
+    output_path: str,
+    report_path: str,
+    output_basename: str,
+    report_basename: str,
+    output_stat: Optional[os.stat_result],
+) -> None:
+    """Render the Results tab; download clicks rerun only this fragment."""
+    # One stable slot per tab so both branches diff inside the same subtree
+    results_slot = st.empty()
+    with results_slot.container():
+        if stats:
+            success_rate = (
+                stats.successful_scrapes / stats.total_searched * 100
+                if stats.total_searched
+                else 0
+            )
+            email_rate = (
+                stats.emails_found / stats.successful_scrapes * 100
+                if stats.successful_scrapes
+                else 0
+            )
+            social_rate = (
+                stats.social_media_found / stats.successful_scrapes * 100
+                if stats.successful_scrapes
+                else 0
+            )
+            total_time = last_duration
+            if total_time is None:
+                total_time = stats.average_time_per_business * stats.total_searched
+
+            st.html(panel_header("Results snapshot", "Key metrics and overall performance for the latest run."))
+            res_col1, res_col2, res_col3, res_col4 = st.columns(4)
+            res_col1.metric("Leads saved", stats.successful_scrapes)
+            res_col2.metric("Listings processed", stats.total_searched)
+            res_col3.metric("Emails found", stats.emails_found)
+            res_col4.metric("Success rate", f"{success_rate:.1f}%")
+
+            st.caption(
+                f"Email success rate: {email_rate:.1f}% | "
+                f"Social profiles found: {stats.social_media_found}"
+            )
+
+            st.html("<div style=\"height: 1rem;\"></div>")
+            st.html(panel_header("Analytics", "Quality signals across email and social enrichment."))
+            ana_col1, ana_col2, ana_col3, ana_col4 = st.columns(4)
+            ana_col1.metric("Email rate", f"{email_rate:.1f}%")
+            ana_col2.metric("Social rate", f"{social_rate:.1f}%")
+            ana_col3.metric("Avg time / business", f"{stats.average_time_per_business:.1f}s")
+            ana_col4.metric("Total runtime", f"{total_time:.1f}s")
+
+            ana_col5, ana_col6, ana_col7, ana_col8 = st.columns(4)
+            ana_col5.metric("Websites visited", stats.websites_visited)
+            ana_col6.metric("Duplicates skipped", stats.duplicates_skipped)
+            ana_col7.metric("Target leads", stats.target_leads)
+            ana_col8.metric("Failed listings", stats.failed_scrapes)
+
+            st.bar_chart(build_rate_df(success_rate, email_rate, social_rate), height=240)
+
+            if output_path:
+                st.html(panel_header("Output files"))
+                st.code(output_path)
+                if report_path:
+                    st.code(report_path)
+
+                report_stat = stat_path(report_path)
+                if output_stat is not None:
+                    st.download_button(
+                        "Download CSV",
+                        data=load_file_bytes(output_path, output_stat),
+                        file_name=output_basename,
+                        mime="text/csv",
+                    )
+
+                if report_stat is not None:
+                    st.download_button(
+                        "Download report",
+                        data=load_file_bytes(report_path, report_stat),
+                        file_name=report_basename,
+                        mime="text/plain",
+                    )
+        else:
+            st.html(RESULTS_EMPTY_PANEL)
+
+
+@st.fragment
+def render_preview_tab(output_path: str, output_stat: Optional[os.stat_result]) -> None:
+    """Render the Data preview tab as its own fragment."""
+    output_df, preview_warning, preview_display = load_output_csv(output_path, output_stat)
+    preview_slot = st.empty()
+    with preview_slot.container():
+        if output_df is not None and not output_df.empty:
+            st.html(panel_header("Data preview", "Review the top rows before exporting."))
+            if preview_warning:
+                st.warning(preview_warning)
+            st.dataframe(preview_display, use_container_width=True)
+        else:
+            st.html(PREVIEW_EMPTY_PANEL)
+
+
+@st.cache_resource
+def tune_gc() -> None:
+    """Tune the collector once per server process."""
+    # Move the long-lived import graph (pandas, pyarrow, streamlit) out of the
+    # tracked generations and raise the gen-0 threshold so per-rerun allocations
+    # trigger far fewer collections.
+    gc.freeze()
+    gc.set_threshold(50_000, 20, 20)
 
 
 def main() -> None:
+    tune_gc()
     apply_theme()
     render_hero()
 
     if "last_output_path" not in st.session_state:
         st.session_state["last_output_path"] = ""
         st.session_state["last_report_path"] = ""
+        st.session_state["last_output_basename"] = ""
+        st.session_state["last_report_basename"] = ""
         st.session_state["last_stats"] = None
-        st.session_state["last_output_df"] = None
         st.session_state["last_duration"] = None
-        st.session_state["last_output_warning"] = ""
+        st.session_state["active_run"] = None
+        st.session_state["last_run"] = None
 
 
     with st.sidebar:
@@ -310,13 +879,20 @@ def main() -> None:
             )
             email_filter_label = st.selectbox(
                 "Email filtering",
-                ["Strict (recommended)", "Balanced", "None (save everything)"],
+                list(EMAIL_FILTER_MODES),
                 index=0,
                 disabled=save_everything,
             )
 
             st.markdown("### Browser")
             headless = st.checkbox("Run browser headless", value=True)
+            max_parallel = st.slider(
+                "Parallel searches",
+                min_value=1,
+                max_value=8,
+                value=4,
+                help="Number of searches scraped at once, each in its own browser.",
+            )
             max_scroll_attempts = st.slider(
                 "Max scroll attempts",
                 min_value=5,
@@ -356,38 +932,23 @@ def main() -> None:
 
             submitted = st.form_submit_button("Start scrape", type="primary")
 
-        results_dir = normalize_results_dir(results_dir_input)
-        output_name = normalize_output_name(output_name)
-        if os.path.isabs(output_name):
-            output_path = output_name
-        else:
-            output_path = os.path.join(results_dir, output_name)
-
-        if dedup_enabled:
-            if os.path.isabs(dedup_db_input):
-                dedup_db_path = dedup_db_input
-            else:
-                dedup_db_path = os.path.join(results_dir, dedup_db_input)
-        else:
-            dedup_db_path = None
+        results_dir, output_path, dedup_db_path = resolve_paths(
+            results_dir_input, output_name, dedup_enabled, dedup_db_input
+        )
 
         if save_everything:
             include_without_email = True
             extract_emails = True
             email_filter_mode = "none"
         else:
-            email_filter_mode = {
-                "Strict (recommended)": "strict",
-                "Balanced": "balanced",
-                "None (save everything)": "none",
-            }.get(email_filter_label, "strict")
+            email_filter_mode = EMAIL_FILTER_MODES.get(email_filter_label, "strict")
 
         st.markdown("### Output path")
         if show_output_path:
             st.code(output_path)
         else:
             st.caption("Output path hidden.")
-        if os.path.exists(output_path) and not append:
+        if not append and stat_path(output_path) is not None:
             st.warning("Output file exists and will be overwritten.")
         if not extract_emails and not include_without_email:
             st.warning("Enable email extraction or allow listings without emails.")
@@ -395,327 +956,65 @@ def main() -> None:
     tabs = st.tabs(["Live run", "Results", "Data preview"])
 
     with tabs[0]:
-        st.markdown("<div class=\"panel\">", unsafe_allow_html=True)
-        st.markdown("<div class=\"section-title\">Live run</div>", unsafe_allow_html=True)
-        st.markdown(
-            "<div class=\"section-subtitle\">"
-            "Track progress, throughput, and scraper signals in real time."
-            "</div>",
-            unsafe_allow_html=True,
-        )
-
-        progress_bar = st.progress(0)
-        status_line = st.empty()
-        listing_status = st.empty()
-
-        col1, col2, col3, col4 = st.columns(4)
-        processed_placeholder = col1.empty()
-        found_placeholder = col2.empty()
-        emails_placeholder = col3.empty()
-        failed_placeholder = col4.empty()
-
-        processed_placeholder.metric("Listings processed", 0)
-        found_placeholder.metric("Leads saved", 0)
-        emails_placeholder.metric("Emails found", 0)
-        failed_placeholder.metric("Failed listings", 0)
-
-        stat_col1, stat_col2, stat_col3 = st.columns(3)
-        websites_placeholder = stat_col1.empty()
-        duplicates_placeholder = stat_col2.empty()
-        listings_total_placeholder = stat_col3.empty()
-        websites_placeholder.metric("Websites visited", 0)
-        duplicates_placeholder.metric("Duplicates skipped", 0)
-        listings_total_placeholder.metric("Listings available", 0)
-
-        log_box = st.empty()
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    if submitted:
-        # Prepare Niches and Locations
-        niches = []
-        if selected_niches:
-            niches.extend(selected_niches)
-        if custom_niches_text.strip():
-            niches.extend([x.strip() for x in custom_niches_text.split('\n') if x.strip()])
-        
-        locations = []
-        if selected_locations:
-            locations.extend(selected_locations)
-        if custom_locations_text.strip():
-            locations.extend([x.strip() for x in custom_locations_text.split('\n') if x.strip()])
-            
-        # Ensure unique and cleaned
-        niches = sorted(list(set(niches)))
-        locations = sorted(list(set(locations)))
-
-        if not niches or not locations:
-             status_line.error("Please provide at least one niche and one location.")
-             st.stop()
-
-        if not extract_emails and not include_without_email:
-            status_line.error("Fix the data capture options before running.")
-            st.stop()
-
-        os.makedirs(results_dir, exist_ok=True)
-        log_lines = []
-        start_ts = time.time()
-        
-        # Build search Queries
-        search_queries = []
-        for n in niches:
-            for l in locations:
-                search_queries.append(f"{n} in {l}")
-        
-        total_queries = len(search_queries)
-        overall_stats = None
-        all_places = []
-        
-        # Initialize progress tracking
-        current_query_index = 0
-        status_line.write(f"Starting batch of {total_queries} searches...")
-
-        def progress_callback(payload: dict) -> None:
-            processed = int(payload.get("processed", 0))
-            found = int(payload.get("found", 0))
-            target = int(payload.get("target", total)) or 1
-            message = payload.get("message", "")
-            listing_index = payload.get("listing_index")
-            listings_total = payload.get("listings_total")
-            websites_visited = int(payload.get("websites_visited", 0))
-            current_found = payload.get("current_found")
-            duplicates_skipped = int(payload.get("duplicates_skipped", 0))
-            
-            # Weighted progress: previous completed terms + current phrase progress
-            if total_queries > 0:
-                base_progress = current_query_index / total_queries
-                # Cap the internal progress for this phrase at 0.99 so we rely on term completion to push it
-                term_progress = min(found / target, 0.99)
-                total_progress = base_progress + (term_progress / total_queries)
-                progress_bar.progress(min(total_progress, 1.0))
-
-            if message:
-                current_query_text = search_queries[current_query_index] if current_query_index < len(search_queries) else "Done"
-                prefix = f"[{current_query_index + 1}/{total_queries}] ({current_query_text}) "
-                log_lines.append(prefix + message)
-            
-            # Only update live status text, don't flood logs
-            status_line.write(f"Running query {current_query_index + 1}/{total_queries}: {search_queries[current_query_index] if current_query_index < len(search_queries) else ''} ...")
-            
-            if listing_index and listings_total:
-                listing_status.write(f"Listing {listing_index} of {listings_total}")
-            elif listings_total:
-                listing_status.write(f"Listings available: {listings_total}")
-
-            # Note: Metrics below show stats for the *current* scrape_places call only if passed from it
-            # We would need a better aggregator for global stats live, but for now we show current run activity
-            processed_placeholder.metric("Listings processed (current)", processed)
-            found_placeholder.metric("Leads saved (current)", found)
-            emails_placeholder.metric("Emails (current)", int(payload.get("emails_found", 0)))
-            
-            if log_lines:
-                log_box.code("\n".join(log_lines[-12:]), language="text")
-
-        # Run Loop
-        for i, query in enumerate(search_queries):
-            current_query_index = i
-            log_lines.append(f"--- Starting: {query} ---")
-            
-            places, stats = scrape_places(
-                query,
-                int(total),
-                include_without_email=include_without_email,
-                extract_emails=extract_emails,
-                email_filter_mode=email_filter_mode,
-                headless=headless,
-                max_scroll_attempts=max_scroll_attempts,
-                max_listings=None if unlimited_scan else int(max_listings),
-                dedup_enabled=dedup_enabled,
-                dedup_db_path=dedup_db_path,
-                show_tqdm=False,
-                progress_callback=progress_callback,
+        st.html(panel_header("Live run", "Track progress, throughput, and scraper signals in real time."))
+
+        if submitted:
+            start_error = start_batch_run(
+                niches=sorted(
+                    {*(selected_niches or []), *(line.strip() for line in custom_niches_text.splitlines())} - {""}
+                ),
+                locations=sorted(
+                    {*(selected_locations or []), *(line.strip() for line in custom_locations_text.splitlines())} - {""}
+                ),
+                results_dir=results_dir,
+                output_path=output_path,
+                append=append,
+                max_parallel=int(max_parallel),
+                scrape_kwargs={
+                    "total": int(total),
+                    "include_without_email": include_without_email,
+                    "extract_emails": extract_emails,
+                    "email_filter_mode": email_filter_mode,
+                    "headless": headless,
+                    "max_scroll_attempts": max_scroll_attempts,
+                    "max_listings": None if unlimited_scan else int(max_listings),
+                    "dedup_enabled": dedup_enabled,
+                    "dedup_db_path": dedup_db_path,
+                    "show_tqdm": False,
+                },
             )
-            
-            all_places.extend(places)
-            
-            # Aggregate stats
-            if overall_stats is None:
-                overall_stats = stats
-            else:
-                overall_stats.total_searched += stats.total_searched
-                overall_stats.successful_scrapes += stats.successful_scrapes
-                overall_stats.failed_scrapes += stats.failed_scrapes
-                overall_stats.duplicates_skipped += stats.duplicates_skipped
-                overall_stats.emails_found += stats.emails_found
-                overall_stats.websites_visited += stats.websites_visited
-                overall_stats.social_media_found += stats.social_media_found
-                overall_stats.target_leads += stats.target_leads # Add expected targets
-
-            # Small pause between queries
-            time.sleep(1.5)
-
-        # Finalize
-        # Append is handled per-batch by save_places_to_csv? No, we should probably save once at the end or incrementally.
-        # Original code saved once. We have 'all_places' now.
-        # But 'append' flag logic in loop: if we save once at end, 'append' flag applies to the file on disk.
-        
-        save_places_to_csv(all_places, output_path, append=append)
-        
-        # Recalculate average time based on total wall clock for the batch?
-        # Or simple average of averages? Averages of averages is bad.
-        # Recalc proper average from total items vs total duration
-        duration = time.time() - start_ts
-        if overall_stats and overall_stats.total_searched > 0:
-            overall_stats.average_time_per_business = duration / overall_stats.total_searched
-            
-        if overall_stats:
-            generate_report(overall_stats, output_path)
-
-        progress_bar.progress(1.0)
-        status_line.write(f"Batch complete in {duration:.1f}s. Scraped {len(search_queries)} queries.")
-
-        st.session_state["last_output_path"] = output_path
-        st.session_state["last_report_path"] = output_path.replace(".csv", "_report.txt")
-        st.session_state["last_stats"] = overall_stats
-        st.session_state["last_duration"] = duration
-        if os.path.exists(output_path):
-            df, warning = load_csv_safe(output_path)
-            st.session_state["last_output_df"] = df
-            st.session_state["last_output_warning"] = warning
+            if start_error:
+                st.error(start_error)
+
+        attach_current_run()
+        # Poll the background run only while one is active.
+        run_every = LIVE_REFRESH_SECONDS if st.session_state.get("active_run") else None
+        st.fragment(render_live_run, run_every=run_every)()
+
+    # The run fragment above reruns the script once a batch finishes, so the
+    # latest results can be read here in one pass for both tabs.
+    session = st.session_state
+    stats = session.get("last_stats")
+    last_duration = session.get("last_duration")
+    output_path = session.get("last_output_path", "")
+    report_path = session.get("last_report_path", "")
+    output_basename = session.get("last_output_basename", "")
+    report_basename = session.get("last_report_basename", "")
+    output_stat = stat_path(output_path)
 
     with tabs[1]:
-        if st.session_state.get("last_stats"):
-            stats = st.session_state["last_stats"]
-            success_rate = (
-                stats.successful_scrapes / stats.total_searched * 100
-                if stats.total_searched
-                else 0
-            )
-            email_rate = (
-                stats.emails_found / stats.successful_scrapes * 100
-                if stats.successful_scrapes
-                else 0
-            )
-            social_rate = (
-                stats.social_media_found / stats.successful_scrapes * 100
-                if stats.successful_scrapes
-                else 0
-            )
-            total_time = st.session_state.get("last_duration")
-            if total_time is None:
-                total_time = stats.average_time_per_business * stats.total_searched
-
-            st.markdown("<div class=\"panel\">", unsafe_allow_html=True)
-            st.markdown("<div class=\"section-title\">Results snapshot</div>", unsafe_allow_html=True)
-            st.markdown(
-                "<div class=\"section-subtitle\">"
-                "Key metrics and overall performance for the latest run."
-                "</div>",
-                unsafe_allow_html=True,
-            )
-            res_col1, res_col2, res_col3, res_col4 = st.columns(4)
-            res_col1.metric("Leads saved", stats.successful_scrapes)
-            res_col2.metric("Listings processed", stats.total_searched)
-            res_col3.metric("Emails found", stats.emails_found)
-            res_col4.metric("Success rate", f"{success_rate:.1f}%")
-
-            st.caption(
-                f"Email success rate: {email_rate:.1f}% | "
-                f"Social profiles found: {stats.social_media_found}"
-            )
-            st.markdown("</div>", unsafe_allow_html=True)
-
-            st.markdown("<div style=\"height: 1rem;\"></div>", unsafe_allow_html=True)
-            st.markdown("<div class=\"panel\">", unsafe_allow_html=True)
-            st.markdown("<div class=\"section-title\">Analytics</div>", unsafe_allow_html=True)
-            st.markdown(
-                "<div class=\"section-subtitle\">"
-                "Quality signals across email and social enrichment."
-                "</div>",
-                unsafe_allow_html=True,
-            )
-            ana_col1, ana_col2, ana_col3, ana_col4 = st.columns(4)
-            ana_col1.metric("Email rate", f"{email_rate:.1f}%")
-            ana_col2.metric("Social rate", f"{social_rate:.1f}%")
-            ana_col3.metric("Avg time / business", f"{stats.average_time_per_business:.1f}s")
-            ana_col4.metric("Total runtime", f"{total_time:.1f}s")
-
-            ana_col5, ana_col6, ana_col7, ana_col8 = st.columns(4)
-            ana_col5.metric("Websites visited", stats.websites_visited)
-            ana_col6.metric("Duplicates skipped", stats.duplicates_skipped)
-            ana_col7.metric("Target leads", stats.target_leads)
-            ana_col8.metric("Failed listings", stats.failed_scrapes)
-
-            import pandas as pd
-            rate_df = pd.DataFrame(
-                {
-                    "Metric": ["Success", "Email", "Social"],
-                    "Percent": [success_rate, email_rate, social_rate],
-                }
-            ).set_index("Metric")
-            st.bar_chart(rate_df, height=240)
-            st.markdown("</div>", unsafe_allow_html=True)
-
-            output_path = st.session_state.get("last_output_path", "")
-            report_path = st.session_state.get("last_report_path", "")
-
-            if output_path:
-                st.markdown("<div class=\"panel\">", unsafe_allow_html=True)
-                st.markdown("<div class=\"section-title\">Output files</div>", unsafe_allow_html=True)
-                st.code(output_path)
-                if report_path:
-                    st.code(report_path)
-
-                if output_path and os.path.exists(output_path):
-                    with open(output_path, "rb") as file_handle:
-                        st.download_button(
-                            "Download CSV",
-                            data=file_handle,
-                            file_name=os.path.basename(output_path),
-                            mime="text/csv",
-                        )
-
-                if report_path and os.path.exists(report_path):
-                    with open(report_path, "rb") as file_handle:
-                        st.download_button(
-                            "Download report",
-                            data=file_handle,
-                            file_name=os.path.basename(report_path),
-                            mime="text/plain",
-                        )
-                st.markdown("</div>", unsafe_allow_html=True)
-        else:
-            st.markdown(
-                "<div class=\"panel\">"
-                "<div class=\"section-title\">Results</div>"
-                "<div class=\"section-subtitle\">Run a scrape to populate results.</div>"
-                "</div>",
-                unsafe_allow_html=True,
-            )
+        render_results_tab(
+            stats,
+            last_duration,
+            output_path,
+            report_path,
+            output_basename,
+            report_basename,
+            output_stat,
+        )
 
     with tabs[2]:
-        output_df = st.session_state.get("last_output_df")
-        if output_df is not None and not output_df.empty:
-            st.markdown("<div class=\"panel\">", unsafe_allow_html=True)
-            st.markdown("<div class=\"section-title\">Data preview</div>", unsafe_allow_html=True)
-            st.markdown(
-                "<div class=\"section-subtitle\">"
-                "Review the top rows before exporting."
-                "</div>",
-                unsafe_allow_html=True,
-            )
-            preview_warning = st.session_state.get("last_output_warning")
-            if preview_warning:
-                st.warning(preview_warning)
-            st.dataframe(output_df.head(200), use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True)
-        else:
-            st.markdown(
-                "<div class=\"panel\">"
-                "<div class=\"section-title\">Data preview</div>"
-                "<div class=\"section-subtitle\">No data loaded yet.</div>"
-                "</div>",
-                unsafe_allow_html=True,
-            )
+        render_preview_tab(output_path, output_stat)
 
 
 if __name__ == "__main__":
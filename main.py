@@ -1,10 +1,10 @@
 from __future__ import annotations
 import logging
-from typing import List, Optional, Dict, Callable
-from playwright.sync_api import sync_playwright, Page
-from dataclasses import dataclass, asdict, fields
-import argparse
+from typing import List, Optional, Dict, Callable, Iterator
+from playwright.sync_api import sync_playwright, Page, Route
+from dataclasses import dataclass, fields
 import platform
+import sys
 import time
 import os
 import re
@@ -12,11 +12,16 @@ import csv
 import sqlite3
 import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
 from tqdm import tqdm
 from functools import wraps
+from operator import attrgetter
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
 
-@dataclass
+@dataclass(slots=True)
 class Place:
     name: str = ""
     address: str = ""
@@ -38,6 +43,11 @@ class Place:
     linkedin: str = ""
     business_category: str = ""
 
+# CSV column order, fixed when the dataclass is defined
+PLACE_COLUMNS = [field.name for field in fields(Place)]
+PLACE_COLUMN_SET = frozenset(PLACE_COLUMNS)
+PLACE_ROW = attrgetter(*PLACE_COLUMNS)
+
 def setup_logging():
     logging.basicConfig(
         level=logging.INFO,
@@ -45,7 +55,9 @@ def setup_logging():
     )
 
 def normalize_key(value: str) -> str:
-    return re.sub(r"\s+", " ", (value or "")).strip().lower()
+    # Same result as collapsing \s+ and stripping: str.split() uses the same
+    # Unicode whitespace table as re's \s, including Maps' \xa0 and \u202f.
+    return " ".join((value or "").split()).lower()
 
 def build_fingerprint(place: Place) -> str:
     key = "|".join([
@@ -61,6 +73,11 @@ def init_dedup_db(db_path: str) -> sqlite3.Connection:
     if db_dir:
         os.makedirs(db_dir, exist_ok=True)
     conn = sqlite3.connect(db_path)
+    # WAL lets parallel searches read while another one writes, and with
+    # synchronous=NORMAL a commit no longer waits on an fsync (only
+    # checkpoints do).
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS leads (
@@ -77,47 +94,53 @@ def init_dedup_db(db_path: str) -> sqlite3.Connection:
     conn.commit()
     return conn
 
-def is_duplicate(conn: sqlite3.Connection, fingerprint: str, email: str) -> bool:
-    row = conn.execute(
-        "SELECT email FROM leads WHERE fingerprint = ?",
-        (fingerprint,),
-    ).fetchone()
-    if not row:
+def load_known_leads(conn: sqlite3.Connection) -> Dict[str, str]:
+    """Map each stored fingerprint to its stored email, as of this call."""
+    return dict(conn.execute("SELECT fingerprint, TRIM(COALESCE(email, '')) FROM leads"))
+
+def is_duplicate(known: Dict[str, str], fingerprint: str, email: str) -> bool:
+    if fingerprint not in known:
         return False
-    existing_email = (row[0] or "").strip()
-    if existing_email:
+    if known[fingerprint]:
         return True
     return not bool(email)
 
-def upsert_lead(conn: sqlite3.Connection, fingerprint: str, place: Place) -> None:
-    conn.execute(
-        """
-        INSERT INTO leads (fingerprint, name, address, website, phone_number, email, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(fingerprint) DO UPDATE SET
-            name = excluded.name,
-            address = excluded.address,
-            website = excluded.website,
-            phone_number = excluded.phone_number,
-            email = CASE
-                WHEN leads.email IS NULL OR leads.email = '' THEN excluded.email
-                ELSE leads.email
-            END,
-            updated_at = excluded.updated_at
-        """,
-        (
-            fingerprint,
-            place.name,
-            place.address,
-            place.website,
-            place.phone_number,
-            place.email,
-            time.strftime('%Y-%m-%d %H:%M:%S'),
-        ),
+UPSERT_LEAD_SQL = """
+    INSERT INTO leads (fingerprint, name, address, website, phone_number, email, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(fingerprint) DO UPDATE SET
+        name = excluded.name,
+        address = excluded.address,
+        website = excluded.website,
+        phone_number = excluded.phone_number,
+        email = CASE
+            WHEN leads.email IS NULL OR leads.email = '' THEN excluded.email
+            ELSE leads.email
+        END,
+        updated_at = excluded.updated_at
+"""
+# Leads buffered before one executemany + commit
+LEAD_FLUSH_SIZE = 100
+
+def lead_row(fingerprint: str, place: Place) -> tuple:
+    return (
+        fingerprint,
+        place.name,
+        place.address,
+        place.website,
+        place.phone_number,
+        place.email,
     )
-    conn.commit()
 
-@dataclass
+def upsert_leads(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+    """Upsert buffered lead rows in a single transaction."""
+    if not rows:
+        return
+    updated_at = time.strftime('%Y-%m-%d %H:%M:%S')
+    with conn:
+        conn.executemany(UPSERT_LEAD_SQL, [row + (updated_at,) for row in rows])
+
+@dataclass(slots=True)
 class ScrapingStats:
     total_searched: int = 0
     successful_scrapes: int = 0
@@ -131,6 +154,22 @@ class ScrapingStats:
     average_time_per_business: float = 0.0
     target_leads: int = 0
 
+    COUNTER_FIELDS = (
+        "total_searched",
+        "successful_scrapes",
+        "failed_scrapes",
+        "duplicates_skipped",
+        "emails_found",
+        "websites_visited",
+        "social_media_found",
+        "target_leads",
+    )
+
+    def merge(self, other: ScrapingStats) -> None:
+        """Add the counters of another run into this one."""
+        for name in self.COUNTER_FIELDS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
 def retry_on_failure(max_retries=3, delay=2):
     """Decorator to retry functions on failure with exponential backoff."""
     def decorator(func):
@@ -152,48 +191,72 @@ def retry_on_failure(max_retries=3, delay=2):
         return wrapper
     return decorator
 
+BUSINESS_CATEGORIES = {
+    'Restaurant': ('restaurant', 'cafe', 'diner', 'food', 'pizza', 'burger', 'bar', 'grill', 'kitchen', 'bistro'),
+    'Retail': ('store', 'shop', 'boutique', 'market', 'mall', 'retail', 'clothing', 'fashion'),
+    'Service': ('salon', 'spa', 'repair', 'cleaning', 'consulting', 'service', 'agency', 'studio'),
+    'Healthcare': ('hospital', 'clinic', 'dentist', 'pharmacy', 'medical', 'health', 'wellness', 'therapy'),
+    'Entertainment': ('theater', 'cinema', 'museum', 'park', 'gym', 'fitness', 'entertainment', 'venue'),
+    'Accommodation': ('hotel', 'motel', 'inn', 'resort', 'lodging', 'bnb', 'guesthouse'),
+    'Education': ('school', 'university', 'college', 'academy', 'training', 'education'),
+    'Automotive': ('car', 'auto', 'automotive', 'repair', 'mechanic', 'dealership'),
+    'Finance': ('bank', 'finance', 'insurance', 'accounting', 'financial', 'credit'),
+}
+
+# Compiled once at import. The email pattern is applied to the raw response
+# bytes so pages are never decoded as a whole. Each social platform keeps its
+# own pattern: one alternation would miss a link that overlaps another
+# platform's match, such as a profile URL inside a share link.
+EMAIL_RE = re.compile(rb'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+SOCIAL_PATTERNS = {
+    'facebook': re.compile(r'facebook\.com/[^"\s]+'),
+    'instagram': re.compile(r'instagram\.com/[^"\s]+'),
+    'twitter': re.compile(r'twitter\.com/[^"\s]+|x\.com/[^"\s]+'),
+    'linkedin': re.compile(r'linkedin\.com/[^"\s]+'),
+}
+# Substring matches, like the keyword checks they replace
+SUPPORT_EMAIL_RE = re.compile(
+    'support|help|info|contact|admin|noreply|no-reply|sales|feedback|abuse|webmaster'
+)
+PLACEHOLDER_EMAIL_RE = re.compile(r'user@domain\.com|example\.com|yourname@|email@domain\.com')
+INVALID_EMAIL_RE = re.compile(r'\.jpg|\.png|\.gif|\.pdf|\.zip|@mobile|@desktop')
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
 def classify_business_type(name: str, introduction: str, place_type: str) -> str:
     """Classify business into categories based on name, description, and type."""
     text = f"{name} {introduction} {place_type}".lower()
 
-    categories = {
-        'restaurant': ['restaurant', 'cafe', 'diner', 'food', 'pizza', 'burger', 'bar', 'grill', 'kitchen', 'bistro'],
-        'retail': ['store', 'shop', 'boutique', 'market', 'mall', 'retail', 'clothing', 'fashion'],
-        'service': ['salon', 'spa', 'repair', 'cleaning', 'consulting', 'service', 'agency', 'studio'],
-        'healthcare': ['hospital', 'clinic', 'dentist', 'pharmacy', 'medical', 'health', 'wellness', 'therapy'],
-        'entertainment': ['theater', 'cinema', 'museum', 'park', 'gym', 'fitness', 'entertainment', 'venue'],
-        'accommodation': ['hotel', 'motel', 'inn', 'resort', 'lodging', 'bnb', 'guesthouse'],
-        'education': ['school', 'university', 'college', 'academy', 'training', 'education'],
-        'automotive': ['car', 'auto', 'automotive', 'repair', 'mechanic', 'dealership'],
-        'finance': ['bank', 'finance', 'insurance', 'accounting', 'financial', 'credit']
-    }
-
-    for category, keywords in categories.items():
+    for category, keywords in BUSINESS_CATEGORIES.items():
         if any(keyword in text for keyword in keywords):
-            return category.title()
+            return category
 
     return "Other"
 
+# The listing's details live in the role="main" panels; serializing just those
+# skips the map, scripts and the rest of the app shell that page.content() returns.
+MAIN_PANEL_HTML_JS = """
+() => {
+    const panels = document.querySelectorAll('div[role="main"]');
+    return panels.length ? Array.from(panels, (panel) => panel.outerHTML).join("\\n") : null;
+}
+"""
+
 def extract_social_media(page: Page) -> Dict[str, str]:
     """Extract social media links from business page."""
     social_media = {}
 
     try:
-        # Look for social media links in the page content
-        page_content = page.content()
-
-        social_patterns = {
-            'facebook': r'facebook\.com/[^"\s]+',
-            'instagram': r'instagram\.com/[^"\s]+',
-            'twitter': r'twitter\.com/[^"\s]+|x\.com/[^"\s]+',
-            'linkedin': r'linkedin\.com/[^"\s]+'
-        }
-
-        for platform, pattern in social_patterns.items():
-            matches = re.findall(pattern, page_content)
-            if matches:
+        # Look for social media links in the listing panel, or the whole
+        # page if Maps changed its layout
+        page_content = page.evaluate(MAIN_PANEL_HTML_JS) or page.content()
+
+        for platform, pattern in SOCIAL_PATTERNS.items():
+            match = pattern.search(page_content)
+            if match:
                 # Clean up the URL and ensure it starts with https://
-                url = matches[0].strip('/')
+                url = match.group().strip('/')
                 if not url.startswith(('http://', 'https://')):
                     url = f"https://{url}"
                 social_media[platform] = url
@@ -203,13 +266,149 @@ def extract_social_media(page: Page) -> Dict[str, str]:
 
     return social_media
 
-def extract_text(page: Page, xpath: str) -> str:
+# Resolves every XPath in one round trip. A single match gives its innerText,
+# anything else the match count, mirroring the strict locator this replaced.
+EXTRACT_TEXTS_JS = """
+(xpaths) => xpaths.map((xpath) => {
+    const result = document.evaluate(
+        xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    if (result.snapshotLength !== 1) {
+        return result.snapshotLength;
+    }
+    const node = result.snapshotItem(0);
+    return node.innerText ?? node.textContent;
+})
+"""
+
+def extract_texts(page: Page, xpaths: List[str]) -> List[str]:
     try:
-        if page.locator(xpath).count() > 0:
-            return page.locator(xpath).inner_text()
+        values = page.evaluate(EXTRACT_TEXTS_JS, xpaths)
     except Exception as e:
-        logging.warning(f"Failed to extract text for xpath {xpath}: {e}")
-    return ""
+        logging.warning(f"Failed to extract text for {len(xpaths)} xpaths: {e}")
+        return [""] * len(xpaths)
+    texts = []
+    for xpath, value in zip(xpaths, values):
+        if isinstance(value, str):
+            texts.append(value)
+            continue
+        if value:
+            logging.warning(f"Failed to extract text for xpath {xpath}: {value} elements matched")
+        texts.append("")
+    return texts
+
+# Both pools are shared by every scrape in the process, so together they cap
+# the open website connections however many searches run in parallel.
+# Homepage lookups get their own pool: they wait on PAGE_FETCH_POOL for
+# contact pages, so running them there could starve it.
+WEBSITE_FETCH_WORKERS = 16
+PAGE_FETCH_WORKERS = 16
+WEBSITE_FETCH_POOL = ThreadPoolExecutor(max_workers=WEBSITE_FETCH_WORKERS, thread_name_prefix="email")
+PAGE_FETCH_POOL = ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS, thread_name_prefix="email-page")
+
+def build_http_session() -> requests.Session:
+    """Shared session so a site's homepage and contact pages reuse connections."""
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        # Room for every fetch the two pools can run at once
+        pool_maxsize=WEBSITE_FETCH_WORKERS + PAGE_FETCH_WORKERS,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+HTTP_SESSION = build_http_session()
+
+# Pages are read in chunks and abandoned once a usable address turns up; the
+# cap bounds the work on very large pages and files behind a contact link.
+PAGE_CHUNK_SIZE = 64 * 1024
+PAGE_BYTE_LIMIT = 4 * 1024 * 1024
+HREF_RE = re.compile(rb'''href\s*=\s*["']([^"'#>]+)''', re.IGNORECASE)
+CONTACT_LINK_RE = re.compile(r'contact|kontakt|impressum|about', re.IGNORECASE)
+CONTACT_PAGE_RE = re.compile(r'contact|kontakt|impressum', re.IGNORECASE)
+MAX_CONTACT_LINKS = 4
+EMAIL_BYTES = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-@')
+
+def is_valid_email(email: str, email_filter_mode: str) -> bool:
+    if email_filter_mode == "none":
+        return True
+    email_lower = email.lower()
+    # Skip obvious placeholders
+    if PLACEHOLDER_EMAIL_RE.search(email_lower):
+        return False
+    # Skip emails with file extensions or invalid characters
+    if INVALID_EMAIL_RE.search(email_lower):
+        return False
+    # Skip emails that don't have proper domain structure
+    if email.count('@') != 1 or email.count('.') < 1:
+        return False
+    if email_filter_mode == "strict" and SUPPORT_EMAIL_RE.search(email_lower):
+        return False
+    return True
+
+def iter_response_emails(response: requests.Response, buffer: Optional[bytearray] = None) -> Iterator[str]:
+    """Yield the email addresses in a streamed response as its body arrives."""
+    if buffer is None:
+        buffer = bytearray()
+    pos = 0
+    for chunk in response.iter_content(PAGE_CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) >= PAGE_BYTE_LIMIT:
+            break
+        # Hold back the trailing run of address characters; it may continue
+        # in the next chunk. Everything before it is final.
+        end = len(buffer)
+        while end > pos and buffer[end - 1] in EMAIL_BYTES:
+            end -= 1
+        for match in EMAIL_RE.finditer(buffer, pos, end):
+            # The pattern only matches ASCII, so the hits decode without errors
+            yield match.group().decode('ascii')
+        pos = max(pos, end)
+    for match in EMAIL_RE.finditer(buffer, pos):
+        yield match.group().decode('ascii')
+
+def fetch_page_email(page_url: str, email_filter_mode: str, buffer: Optional[bytearray] = None) -> Optional[str]:
+    """
+    Return the first valid email on a page.
+    Returns "" when the page only has filtered-out addresses, and None when it
+    has none at all or could not be fetched. The bytes read are left in buffer.
+    """
+    try:
+        with HTTP_SESSION.get(page_url, timeout=(3, 7), stream=True) as response:
+            response.raise_for_status()
+            found = None
+            for email in iter_response_emails(response, buffer):
+                if is_valid_email(email, email_filter_mode):
+                    return email
+                found = ""
+            return found
+    except Exception:
+        return None
+
+def website_domain(website_url: str) -> str:
+    if not website_url.startswith(('http://', 'https://')):
+        website_url = 'https://' + website_url
+    return urlparse(website_url).netloc.lower().removeprefix('www.')
+
+def find_contact_links(body: bytes, page_url: str) -> List[str]:
+    """Return same-site contact/about links from a page, contact pages first."""
+    host = urlparse(page_url).netloc.lower().removeprefix('www.')
+    links = []
+    for match in HREF_RE.finditer(body):
+        href = match.group(1).decode('utf-8', 'ignore').strip()
+        if not CONTACT_LINK_RE.search(href):
+            continue
+        url = urljoin(page_url, href)
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or parsed.netloc.lower().removeprefix('www.') != host:
+            continue
+        if url != page_url and url not in links:
+            links.append(url)
+    links.sort(key=lambda url: not CONTACT_PAGE_RE.search(url))
+    return links[:MAX_CONTACT_LINKS]
 
 @retry_on_failure(max_retries=3, delay=1)
 def extract_emails_from_website(website_url: str, *, email_filter_mode: str = "strict") -> str:
@@ -229,81 +428,42 @@ def extract_emails_from_website(website_url: str, *, email_filter_mode: str = "s
         parsed_url = urlparse(website_url)
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
 
-        # Use requests to get the page content
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        # Try multiple pages: homepage, contact page, about page
-        pages_to_try = [
-            website_url,  # Homepage
-            urljoin(base_url, '/contact'),
-            urljoin(base_url, '/contact-us'),
-            urljoin(base_url, '/about'),
-            urljoin(base_url, '/about-us'),
-        ]
-
-        all_emails = []
-
-        for page_url in pages_to_try:
-            try:
-                response = requests.get(page_url, headers=headers, timeout=10)
-                response.raise_for_status()
-
-                # Extract emails using regex - more strict pattern
-                email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-                emails = re.findall(email_pattern, response.text)
-
-                # Add to collection
-                all_emails.extend(emails)
-
-                # If we found emails on this page, we can stop trying other pages
-                if emails:
-                    break
-
-            except Exception:
-                continue  # Try next page
-
         email_filter_mode = (email_filter_mode or "strict").lower()
         if email_filter_mode not in {"strict", "balanced", "none"}:
             email_filter_mode = "strict"
 
-        if email_filter_mode == "none":
-            if all_emails:
-                logging.info(f"Found email for {website_url}: {all_emails[0]}")
-                return all_emails[0]
-            logging.info(f"No email found for {website_url}")
-            return ""
-
-        filtered_emails = []
-        support_keywords = [
-            'support', 'help', 'info', 'contact', 'admin', 'noreply', 'no-reply',
-            'sales', 'feedback', 'abuse', 'webmaster'
-        ]
-        placeholders = ['user@domain.com', 'example.com', 'yourname@', 'email@domain.com']
-        invalid_substrings = ['.jpg', '.png', '.gif', '.pdf', '.zip', '@mobile', '@desktop']
-
-        for email in all_emails:
-            email_lower = email.lower()
-            # Skip obvious placeholders
-            if any(placeholder in email_lower for placeholder in placeholders):
-                continue
-            # Skip emails with file extensions or invalid characters
-            if any(invalid in email_lower for invalid in invalid_substrings):
-                continue
-            # Skip emails that don't have proper domain structure
-            if email.count('@') != 1 or email.count('.') < 1:
-                continue
-            if email_filter_mode == "strict":
-                if any(keyword in email_lower for keyword in support_keywords):
-                    continue
-            if email not in filtered_emails:
-                filtered_emails.append(email)
+        # Most sites list an email on the homepage, so fetch it alone first and
+        # only fan out to the contact/about pages when it has none. The first
+        # page (homepage, then the list below) with any email decides the result.
+        homepage = bytearray()
+        email = fetch_page_email(website_url, email_filter_mode, homepage)
+        if email is None:
+            # Prefer the site's own contact/about links; guess the usual
+            # paths only when the homepage doesn't link any.
+            pages_to_try = find_contact_links(bytes(homepage), website_url) or [
+                urljoin(base_url, '/contact'),
+                urljoin(base_url, '/contact-us'),
+                urljoin(base_url, '/about'),
+                urljoin(base_url, '/about-us'),
+            ]
+            futures = [
+                PAGE_FETCH_POOL.submit(fetch_page_email, page_url, email_filter_mode)
+                for page_url in pages_to_try
+            ]
+            for future in futures:
+                email = future.result()
+                if email is not None:
+                    break
+            for future in futures:
+                future.cancel()
 
-        if filtered_emails:
-            logging.info(f"Found email for {website_url}: {filtered_emails[0]}")
-            return filtered_emails[0]
-        logging.info(f"No valid email found for {website_url}")
+        if email:
+            logging.info(f"Found email for {website_url}: {email}")
+            return email
+        if email is None:
+            logging.info(f"No email found for {website_url}")
+        else:
+            logging.info(f"No valid email found for {website_url}")
         return ""
 
     except Exception as e:
@@ -330,19 +490,26 @@ def extract_place(
     place_type_xpath = '//div[@class="LBgpqf"]//button[@class="DkEaL "]'
     intro_xpath = '//div[@class="WeS02d fontBodyMedium"]//div[@class="PYvSYb "]'
 
+    xpaths = [
+        name_xpath, address_xpath, website_xpath, phone_number_xpath,
+        reviews_count_xpath, reviews_average_xpath, info1, info2, info3,
+        opens_at_xpath, opens_at_xpath2, place_type_xpath, intro_xpath,
+    ]
+    texts = dict(zip(xpaths, extract_texts(page, xpaths)))
+
     place = Place()
-    place.name = extract_text(page, name_xpath)
-    place.address = extract_text(page, address_xpath)
-    place.website = extract_text(page, website_xpath)
+    place.name = texts[name_xpath]
+    place.address = texts[address_xpath]
+    place.website = texts[website_xpath]
     # Extract email from website if available
     place.email = (
         extract_emails_from_website(place.website, email_filter_mode=email_filter_mode)
         if extract_emails
         else ""
     )
-    place.phone_number = extract_text(page, phone_number_xpath)
-    place.place_type = extract_text(page, place_type_xpath)
-    place.introduction = extract_text(page, intro_xpath) or "None Found"
+    place.phone_number = texts[phone_number_xpath]
+    place.place_type = texts[place_type_xpath]
+    place.introduction = texts[intro_xpath] or "None Found"
 
     # Extract social media links
     social_media = extract_social_media(page)
@@ -357,7 +524,7 @@ def extract_place(
     )
 
     # Reviews Count
-    reviews_count_raw = extract_text(page, reviews_count_xpath)
+    reviews_count_raw = texts[reviews_count_xpath]
     if reviews_count_raw:
         try:
             temp = reviews_count_raw.replace('\xa0', '').replace('(','').replace(')','').replace(',','')
@@ -365,7 +532,7 @@ def extract_place(
         except Exception as e:
             logging.warning(f"Failed to parse reviews count: {e}")
     # Reviews Average
-    reviews_avg_raw = extract_text(page, reviews_average_xpath)
+    reviews_avg_raw = texts[reviews_average_xpath]
     if reviews_avg_raw:
         try:
             temp = reviews_avg_raw.replace(' ','').replace(',','.')
@@ -374,7 +541,7 @@ def extract_place(
             logging.warning(f"Failed to parse reviews average: {e}")
     # Store Info
     for idx, info_xpath in enumerate([info1, info2, info3]):
-        info_raw = extract_text(page, info_xpath)
+        info_raw = texts[info_xpath]
         if info_raw:
             temp = info_raw.split('·')
             if len(temp) > 1:
@@ -386,7 +553,7 @@ def extract_place(
                 if 'delivery' in check:
                     place.store_delivery = "Yes"
     # Opens At
-    opens_at_raw = extract_text(page, opens_at_xpath)
+    opens_at_raw = texts[opens_at_xpath]
     if opens_at_raw:
         opens = opens_at_raw.split('⋅')
         if len(opens) > 1:
@@ -394,7 +561,7 @@ def extract_place(
         else:
             place.opens_at = opens_at_raw.replace("\u202f","")
     else:
-        opens_at2_raw = extract_text(page, opens_at_xpath2)
+        opens_at2_raw = texts[opens_at_xpath2]
         if opens_at2_raw:
             opens = opens_at2_raw.split('⋅')
             if len(opens) > 1:
@@ -403,6 +570,17 @@ def extract_place(
                 place.opens_at = opens_at2_raw.replace("\u202f","")
     return place
 
+# Never parsed, and map tiles and photos are most of a Maps page's bytes.
+# Stylesheets stay: the results feed only scrolls (and lazy-loads more
+# listings) with Maps' own CSS applied.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+def block_heavy_resources(route: Route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
 def scrape_places(
     search_for: str,
     total: int,
@@ -417,6 +595,7 @@ def scrape_places(
     dedup_db_path: Optional[str] = None,
     show_tqdm: bool = True,
     progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+    known_leads: Optional[Dict[str, str]] = None,
 ) -> tuple[List[Place], ScrapingStats]:
     setup_logging()
     places: List[Place] = []
@@ -430,6 +609,7 @@ def scrape_places(
         message: str,
         listing_index: Optional[int] = None,
         current_found: Optional[int] = None,
+        final: bool = False,
     ) -> None:
         if not progress_callback:
             return
@@ -446,8 +626,75 @@ def scrape_places(
             "listing_index": listing_index,
             "listings_total": listings_total,
             "current_found": current_found,
+            "final": final,
         })
 
+    def flush_leads() -> None:
+        # A failed dedup write only loses dedup history, never scraped leads
+        try:
+            upsert_leads(dedup_conn, list(pending_leads.values()))
+        except Exception as e:
+            logging.warning(f"Failed to save {len(pending_leads)} leads to the dedup database: {e}")
+        pending_leads.clear()
+
+    def record_place(idx: int, place: Place, pbar: tqdm) -> None:
+        should_save = bool(place.name) and (include_without_email or bool(place.email))
+        fingerprint = None
+        if should_save and dedup_conn:
+            fingerprint = build_fingerprint(place)
+            if is_duplicate(known_leads, fingerprint, place.email):
+                stats.duplicates_skipped += 1
+                logging.info(f"Duplicate skipped: {place.name}")
+                send_progress(f"Duplicate skipped: {place.name}", listing_index=idx + 1)
+                return
+        if should_save:
+            places.append(place)
+            stats.successful_scrapes += 1
+
+            # Update statistics
+            if place.email:
+                stats.emails_found += 1
+            if any([place.facebook, place.instagram, place.twitter, place.linkedin]):
+                stats.social_media_found += 1
+            if place.email:
+                logging.info(f"Lead found with email: {place.name} - {place.email}")
+                send_progress(f"Saved lead: {place.name}", listing_index=idx + 1)
+            else:
+                logging.info(f"Lead saved without email: {place.name}")
+                send_progress(f"Saved lead without email: {place.name}", listing_index=idx + 1)
+            if dedup_conn:
+                fingerprint = fingerprint or build_fingerprint(place)
+                pending_leads[fingerprint] = lead_row(fingerprint, place)
+                # Mirrors the upsert: a stored email is never replaced
+                known_leads[fingerprint] = known_leads.get(fingerprint) or place.email
+                if len(pending_leads) >= LEAD_FLUSH_SIZE:
+                    flush_leads()
+            pbar.update(1)
+        elif place.name:
+            stats.failed_scrapes += 1
+            logging.info(f"Business '{place.name}' found but no valid email, skipping.")
+            send_progress(f"Skipped (no email): {place.name}", listing_index=idx + 1)
+        else:
+            stats.failed_scrapes += 1
+            logging.warning(f"No name found for listing {idx+1}, skipping.")
+            send_progress(f"Skipped listing {idx + 1} with missing name", listing_index=idx + 1)
+
+    def finish_email_job(pbar: tqdm) -> None:
+        # Jobs finish in listing order so the CSV keeps the Maps ranking.
+        idx, place, future = email_jobs.popleft()
+        try:
+            if future is not None:
+                # Wait through Playwright so the route handler keeps the page
+                # loading instead of stalling every request on this thread.
+                while not future.done():
+                    page.wait_for_timeout(100)
+                place.email = future.result() or ""
+            record_place(idx, place, pbar)
+        except Exception as e:
+            stats.failed_scrapes += 1
+            logging.warning(f"Failed to extract listing {idx+1}: {e}")
+            send_progress(f"Error on listing {idx + 1}: {e}", listing_index=idx + 1)
+
     if max_listings is None:
         # Default to target if not specified to avoid scanning the entire list by default
         max_listings = total
@@ -455,10 +702,18 @@ def scrape_places(
         max_listings = max(max_listings, total)
 
     dedup_conn = None
+    pending_leads: Dict[str, tuple] = {}
     if dedup_enabled:
         if not dedup_db_path:
             dedup_db_path = os.path.join("results", "dedup.sqlite")
         dedup_conn = init_dedup_db(dedup_db_path)
+        # Parallel searches pass one shared map so they see each other's
+        # leads; otherwise read the database as it stands now.
+        if known_leads is None:
+            known_leads = load_known_leads(dedup_conn)
+
+    email_jobs: deque = deque()
+    domain_lookups: Dict[str, Future] = {}
 
     start_time = time.time()
 
@@ -480,6 +735,7 @@ def scrape_places(
             # Set a common user agent to avoid bot detection and inconsistent UI
             user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             context = browser.new_context(user_agent=user_agent)
+            context.route("**/*", block_heavy_resources)
             page = context.new_page()
             try:
                 logging.info("Navigating to Google Maps (English)...")
@@ -577,6 +833,12 @@ def scrape_places(
 
                 with tqdm(total=total, desc="Finding leads", unit="lead", disable=not show_tqdm) as pbar:
                     for idx, listing in enumerate(listings):
+                        # Record finished lookups, and wait for pending ones
+                        # once they could already make up the target.
+                        while email_jobs and (email_jobs[0][2] is None or email_jobs[0][2].done()):
+                            finish_email_job(pbar)
+                        while email_jobs and len(places) + len(email_jobs) >= total:
+                            finish_email_job(pbar)
                         if len(places) >= total:
                             logging.info(f"Reached target of {total} leads, stopping.")
                             break
@@ -588,128 +850,118 @@ def scrape_places(
                             send_progress(f"Processing listing {idx + 1}", listing_index=idx + 1)
                             listing.click()
                             page.wait_for_selector('//div[@class="TIHn2 "]//h1[@class="DUwDvf lfPIob"]', timeout=10000)
-                            time.sleep(1.5)  # Give time for details to load
+                            # Give time for details to load; unlike time.sleep this
+                            # keeps serving the resource route, so requests aren't stalled
+                            page.wait_for_timeout(1500)
                             place = extract_place(
                                 page,
-                                extract_emails=extract_emails,
+                                extract_emails=False,
                                 email_filter_mode=email_filter_mode,
                             )
                             if extract_emails and place.website and place.website != "None Found":
-                                stats.websites_visited += 1
-                            should_save = bool(place.name) and (include_without_email or bool(place.email))
-                            fingerprint = None
-                            if should_save and dedup_conn:
-                                fingerprint = build_fingerprint(place)
-                                if is_duplicate(dedup_conn, fingerprint, place.email):
-                                    stats.duplicates_skipped += 1
-                                    logging.info(f"Duplicate skipped: {place.name}")
-                                    send_progress(f"Duplicate skipped: {place.name}", listing_index=idx + 1)
-                                    continue
-                            if should_save:
-                                places.append(place)
-                                stats.successful_scrapes += 1
-
-                                # Update statistics
-                                if place.email:
-                                    stats.emails_found += 1
-                                if any([place.facebook, place.instagram, place.twitter, place.linkedin]):
-                                    stats.social_media_found += 1
-                                if place.email:
-                                    logging.info(f"Lead found with email: {place.name} - {place.email}")
-                                    send_progress(f"Saved lead: {place.name}", listing_index=idx + 1)
-                                else:
-                                    logging.info(f"Lead saved without email: {place.name}")
-                                    send_progress(f"Saved lead without email: {place.name}", listing_index=idx + 1)
-                                if dedup_conn:
-                                    upsert_lead(dedup_conn, fingerprint or build_fingerprint(place), place)
-                                pbar.update(1)
-                            elif place.name:
-                                stats.failed_scrapes += 1
-                                logging.info(f"Business '{place.name}' found but no valid email, skipping.")
-                                send_progress(f"Skipped (no email): {place.name}", listing_index=idx + 1)
+                                # Chain locations usually share one site, so each
+                                # domain is looked up once per run.
+                                domain = website_domain(place.website)
+                                future = domain_lookups.get(domain)
+                                if future is None:
+                                    stats.websites_visited += 1
+                                    # Visit the website off the browser thread and
+                                    # move straight on to the next listing.
+                                    future = WEBSITE_FETCH_POOL.submit(
+                                        extract_emails_from_website,
+                                        place.website,
+                                        email_filter_mode=email_filter_mode,
+                                    )
+                                    domain_lookups[domain] = future
+                                email_jobs.append((idx, place, future))
+                            elif email_jobs:
+                                # Queue behind the pending lookups to keep order
+                                email_jobs.append((idx, place, None))
                             else:
-                                stats.failed_scrapes += 1
-                                logging.warning(f"No name found for listing {idx+1}, skipping.")
-                                send_progress(f"Skipped listing {idx + 1} with missing name", listing_index=idx + 1)
+                                record_place(idx, place, pbar)
                         except Exception as e:
                             stats.failed_scrapes += 1
                             logging.warning(f"Failed to extract listing {idx+1}: {e}")
                             send_progress(f"Error on listing {idx + 1}: {e}", listing_index=idx + 1)
+                    while email_jobs:
+                        finish_email_job(pbar)
             finally:
                 try:
                     browser.close()
                 except Exception as e:
                     logging.warning(f"Failed to close browser cleanly: {e}")
     finally:
+        # The pool outlives this scrape, so drop only its queued lookups
+        for future in domain_lookups.values():
+            future.cancel()
         if dedup_conn:
-            dedup_conn.close()
+            try:
+                flush_leads()
+            finally:
+                dedup_conn.close()
 
     # Calculate final statistics
     end_time = time.time()
     stats.end_time = time.strftime('%Y-%m-%d %H:%M:%S')
     stats.total_searched = listings_processed
     stats.average_time_per_business = (end_time - start_time) / listings_processed if listings_processed else 0
+    send_progress(f"Finished search: {search_for}", final=True)
 
     return places, stats
 
 def save_places_to_csv(places: List[Place], output_path: str = "result.csv", append: bool = False):
-    """Save places to CSV. Uses pandas if available, otherwise falls back to the csv module."""
-    rows = [asdict(place) for place in places]
-    if not rows:
+    """Save places to CSV, streaming rows through csv.writer."""
+    if not places:
         logging.warning("No data to save; list of places is empty.")
         return
 
-    try:
-        import pandas as pd
-        df = pd.DataFrame(rows)
-        column_order = [field.name for field in fields(Place)]
-        for column in column_order:
-            if column not in df.columns:
-                df[column] = ""
-        df = df.reindex(columns=column_order)
-        file_exists = os.path.isfile(output_path)
-        if append and file_exists:
-            with open(output_path, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                existing_header = next(reader, None)
-            if existing_header:
-                missing = [col for col in existing_header if col not in df.columns]
-                for col in missing:
-                    df[col] = ""
-                if existing_header != list(df.columns):
-                    logging.warning(
-                        "Output columns differ from existing file. "
-                        "Aligning to existing header to keep CSV consistent."
-                    )
-                df = df.reindex(columns=existing_header)
-        mode = "a" if append else "w"
-        header = not (append and file_exists)
-        df.to_csv(output_path, index=False, mode=mode, header=header)
-        logging.info(f"Saved {len(df)} places to {output_path} (append={append}) using pandas")
-    except Exception as e:
-        logging.warning(f"Pandas unavailable or failed ({e}); falling back to csv writer.")
-        # Use csv.DictWriter as a safe fallback
-        column_order = [field.name for field in fields(Place)]
-        file_exists = os.path.isfile(output_path)
-        mode = 'a' if append else 'w'
-        header_needed = not (append and file_exists)
-        with open(output_path, mode=mode, newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=column_order)
-            if header_needed:
-                writer.writeheader()
-            for row in rows:
-                # Ensure all keys exist
-                out = {k: row.get(k, "") for k in column_order}
-                writer.writerow(out)
-        logging.info(f"Saved {len(rows)} places to {output_path} (append={append}) using csv module")
-
-def generate_report(stats: ScrapingStats, output_path: str):
-    """Generate a scraping report."""
-    report_path = output_path.replace('.csv', '_report.txt')
+    column_order = PLACE_COLUMNS
+    file_exists = os.path.isfile(output_path)
+    if append and file_exists:
+        with open(output_path, newline='', encoding='utf-8') as f:
+            existing_header = next(csv.reader(f), None)
+        if existing_header:
+            if existing_header != column_order:
+                logging.warning(
+                    "Output columns differ from existing file. "
+                    "Aligning to existing header to keep CSV consistent."
+                )
+            column_order = existing_header
+
+    mode = 'a' if append else 'w'
+    header_needed = not (append and file_exists)
+    if column_order is PLACE_COLUMNS:
+        # One C-level attrgetter call per row instead of an asdict deep copy
+        rows = map(PLACE_ROW, places)
+    elif len(column_order) > 1 and PLACE_COLUMN_SET.issuperset(column_order):
+        rows = map(attrgetter(*column_order), places)
+    else:
+        # Columns only the existing file knows about are left blank
+        rows = ([getattr(place, column, "") for column in column_order] for place in places)
+    with open(output_path, mode=mode, newline='', encoding='utf-8', buffering=1 << 20) as f:
+        # pandas' to_csv ended rows with os.linesep; keep that so appends match older files
+        writer = csv.writer(f, lineterminator=os.linesep)
+        if header_needed:
+            writer.writerow(column_order)
+        writer.writerows(rows)
+    logging.info(f"Saved {len(places)} places to {output_path} (append={append})")
+
+def report_path_for(output_path: str) -> str:
+    """Return the report path that sits next to a results CSV."""
+    return f"{os.path.splitext(output_path)[0]}_report.txt"
+
+def generate_report(stats: ScrapingStats, output_path: str) -> Optional[str]:
+    """Generate a scraping report and return its path, or None if nothing was scraped."""
+    if stats.total_searched == 0:
+        print("📄 No businesses were scraped; report skipped.")
+        return None
+
+    report_path = report_path_for(output_path)
 
     success_rate = (stats.successful_scrapes / stats.total_searched * 100) if stats.total_searched > 0 else 0
     email_rate = (stats.emails_found / stats.successful_scrapes * 100) if stats.successful_scrapes > 0 else 0
     social_rate = (stats.social_media_found / stats.successful_scrapes * 100) if stats.successful_scrapes > 0 else 0
+    duration = stats.average_time_per_business * stats.total_searched
 
     report = f"""
 🗺️ Google Maps Scraper Report
@@ -718,7 +970,7 @@ def generate_report(stats: ScrapingStats, output_path: str):
 📊 SCRAPING SUMMARY
 Started: {stats.start_time}
 Completed: {stats.end_time}
-Duration: {stats.average_time_per_business * stats.total_searched:.1f} seconds
+Duration: {duration:.1f} seconds
 
 🎯 BUSINESS RESULTS
 Target leads: {stats.target_leads}
@@ -739,7 +991,7 @@ Social media rate: {social_rate:.1f}%
 
 ⏱️  PERFORMANCE
 Average time per business: {stats.average_time_per_business:.2f}s
-Total processing time: {stats.average_time_per_business * stats.total_searched:.1f}s
+Total processing time: {duration:.1f}s
 
 📁 Output file: {output_path}
 📄 Report file: {report_path}
@@ -748,14 +1000,28 @@ Total processing time: {stats.average_time_per_business * stats.total_searched:.
     with open(report_path, 'w', encoding='utf-8') as f:
         f.write(report)
 
-    print(f"\n📊 Scraping Report Generated:")
-    print(f"   Target Leads: {stats.target_leads}")
-    print(f"   Leads Found: {stats.successful_scrapes}")
-    print(f"   Success Rate: {success_rate:.1f}%")
-    print(f"   Emails Found: {stats.emails_found}")
-    print(f"   Duplicates Skipped: {stats.duplicates_skipped}")
-    print(f"   Social Media: {stats.social_media_found}")
-    print(f"   Report saved to: {report_path}")
+    # One write to the console; print() would write the line ending separately
+    sys.stdout.write("\n".join([
+        "\n📊 Scraping Report Generated:",
+        f"   Target Leads: {stats.target_leads}",
+        f"   Leads Found: {stats.successful_scrapes}",
+        f"   Success Rate: {success_rate:.1f}%",
+        f"   Emails Found: {stats.emails_found}",
+        f"   Duplicates Skipped: {stats.duplicates_skipped}",
+        f"   Social Media: {stats.social_media_found}",
+        f"   Report saved to: {report_path}",
+        "",
+    ]))
+    return report_path
+
+def normalize_output_path(output_path: str, results_folder: str) -> str:
+    """Return the CSV path for a user-supplied name, inside results_folder unless already placed."""
+    if not output_path.lower().endswith('.csv'):
+        output_path += '.csv'
+    # If output path doesn't start with results folder, prepend it
+    if not os.path.isabs(output_path) and not output_path.startswith(results_folder + os.sep):
+        output_path = os.path.join(results_folder, output_path)
+    return output_path
 
 def get_user_input(results_folder: str = "results"):
     """Get user input interactively."""
@@ -796,13 +1062,7 @@ def get_user_input(results_folder: str = "results"):
     # Get output file path
     default_filename = "results.csv"
     output_path = input(f"\n💾 Output file name (default: {default_filename}): ").strip()
-    if not output_path:
-        output_path = default_filename
-    elif not output_path.endswith('.csv'):
-        output_path += '.csv'
-    
-    # Prepend results folder to the path
-    output_path = os.path.join(results_folder, output_path)
+    output_path = normalize_output_path(output_path or default_filename, results_folder)
     
     # Check if file exists and ask about append mode
     file_exists = os.path.exists(output_path)
@@ -821,8 +1081,10 @@ def main():
     os.makedirs(results_folder, exist_ok=True)
     
     # Check if command line arguments are provided
-    import sys
     if len(sys.argv) > 1:
+        # Only the argv path needs argparse; app.py imports this module too
+        import argparse
+
         # Use original argument parsing for backward compatibility
         parser = argparse.ArgumentParser()
         parser.add_argument("-s", "--search", type=str, help="Search query for Google Maps")
@@ -840,10 +1102,7 @@ def main():
         args = parser.parse_args()
         search_for = args.search or "turkish stores in toronto Canada"
         total = args.total or 1
-        # If output path doesn't start with results folder, prepend it
-        output_path = args.output
-        if not output_path.startswith(results_folder + os.sep) and not os.path.isabs(output_path):
-            output_path = os.path.join(results_folder, output_path)
+        output_path = normalize_output_path(args.output, results_folder)
         append = args.append
         include_without_email = args.include_without_email
         extract_emails = not args.no_email_extraction